@@ -4,14 +4,150 @@ Petstore API Client
 Handles HTTP requests to the Petstore API server.
 """
 
+import asyncio
+import hashlib
+import io
+import logging
 import os
+import re
+import cachetools
 import httpx
-from typing import Dict, List, Optional, Any
-import json
+import ijson
+import orjson
+import simdjson
+import tenacity
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds to keep idempotent GET results; inventory counts change more often
+INVENTORY_CACHE_TTL = 5.0
+DETAILS_CACHE_TTL = 30.0
+# Well inside the API's 24h token lifetime
+LOGIN_CACHE_TTL = 300.0
+
+# Simultaneous API requests allowed unless PETSTORE_MAX_CONCURRENCY overrides it
+DEFAULT_MAX_CONCURRENCY = 20
+
+# Total tries for a GET that hits a 5xx or network error
+RETRY_ATTEMPTS = 3
+
+# List responses at least this large are decoded while they download
+STREAM_THRESHOLD = 32 * 1024
+
+# Order bodies have a fixed shape, so they are spliced into a prebuilt skeleton
+_ORDER_BODY = b'{"petId":%d,"quantity":1,"status":"placed","complete":false%s}'
+_NEEDS_JSON_ESCAPE = re.compile(rb'[\x00-\x1f"\\]').search
+
+_PET_LINE = "• {name} (ID: {id}) - {category} - Status: {status} - Tags: {tags}".format
+
+# (label, field, default) rows for the detail formatters
+_ORDER_FIELDS = (
+    ("Order ID", "id", None),
+    ("Pet ID", "petId", None),
+    ("Quantity", "quantity", None),
+    ("Status", "status", None),
+    ("Ship Date", "shipDate", "Not set"),
+    ("Complete", "complete", False)
+)
+_USER_FIELDS = (
+    ("Email", "email", "Not provided"),
+    ("Phone", "phone", "Not provided"),
+    ("Role", "role", "customer"),
+    ("Status", "userStatus", 1)
+)
+
+
+def _parse_inventory_to_lines(body: bytes) -> str:
+    """Render an inventory object as "status: count pets" lines without building a dict."""
+    return "\n".join([
+        f"{status}: {count} pets"
+        for status, count in ijson.kvitems(io.BytesIO(body), "", use_float=True)
+    ])
+
+
+def _max_concurrency_from_env() -> int:
+    """Read PETSTORE_MAX_CONCURRENCY, falling back to the default if it isn't a number."""
+    value = os.getenv("PETSTORE_MAX_CONCURRENCY")
+    if value is None:
+        return DEFAULT_MAX_CONCURRENCY
+    try:
+        limit = int(value)
+    except ValueError:
+        logger.warning("Ignoring non-integer PETSTORE_MAX_CONCURRENCY=%r", value)
+        return DEFAULT_MAX_CONCURRENCY
+    # A limit of 0 would block every request forever
+    return max(limit, 1)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry network errors and 5xx responses, never 4xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.is_server_error
+    return isinstance(exc, httpx.TransportError)
+
+
+def _retrying(method: str) -> tenacity.AsyncRetrying:
+    """Build the retry policy for one request.
+    
+    Only GETs are retried; repeating a POST after an ambiguous failure could
+    place the same order or create the same user twice.
+    """
+    return tenacity.AsyncRetrying(
+        stop=tenacity.stop_after_attempt(RETRY_ATTEMPTS if method == "GET" else 1),
+        wait=tenacity.wait_exponential_jitter(initial=0.1, max=1.0, jitter=0.1),
+        retry=tenacity.retry_if_exception(_is_retryable),
+        reraise=True
+    )
+
+
+def _log_failed_response(response: httpx.Response):
+    """Log a failed API response, decoding its body only when debugging."""
+    logger.warning(
+        "API request failed: %s - %s",
+        response.status_code,
+        response.text if logger.isEnabledFor(logging.DEBUG) else ""
+    )
+
+
+class _AsyncByteReader:
+    """Adapts an async iterator of byte chunks to the ``read()`` interface ijson expects."""
+    
+    __slots__ = ("_chunks", "_pending")
+    
+    def __init__(self, chunks: AsyncIterator[bytes], pending: bytes = b""):
+        self._chunks = chunks
+        self._pending = pending
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs str; don't consume a chunk
+        if size == 0:
+            return b""
+        if self._pending:
+            chunk, self._pending = self._pending, b""
+            return chunk
+        return await anext(self._chunks, b"")
+
 
 class PetstoreClient:
     """Client for interacting with the Petstore API."""
     
+    __slots__ = (
+        "base_url",
+        "timeout",
+        "_url_prefix",
+        "_client",
+        "_auth_token",
+        "_http_version_logged",
+        "_parser",
+        "_max_concurrency",
+        "_sem",
+        "_caches",
+        "_login_cache",
+        "_inflight",
+        "_generation"
+    )
+    
     def __init__(self):
         """Initialize the API client."""
         # Determine API base URL based on environment
@@ -22,7 +158,117 @@ class PetstoreClient:
             # In production, you might get this from another env var
             self.base_url = os.getenv("PRODUCTION_API_URL", "https://api.petstore.example.com")
         
+        self._url_prefix = f"{self.base_url}/api/v3"
         self.timeout = 30.0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._auth_token: Optional[str] = None
+        self._http_version_logged = False
+        self._parser = simdjson.Parser()
+        self._max_concurrency = _max_concurrency_from_env()
+        self._sem: Optional[asyncio.BoundedSemaphore] = None
+        self._caches: Dict[float, cachetools.TTLCache] = {}
+        self._login_cache = cachetools.TTLCache(maxsize=64, ttl=LOGIN_CACHE_TTL)
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._generation = 0
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use.
+        
+        The client ignores proxy/certificate environment variables and
+        never follows redirects. It carries no credentials of its own; every
+        request sends its resolved token via _auth_headers.
+        """
+        if self._client is None:
+            headers = {"Accept-Encoding": "gzip, br"}
+            # Retries are handled by _retrying, so the transport doesn't retry
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+                retries=0
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=headers,
+                follow_redirects=False,
+                trust_env=False,
+                transport=transport
+            )
+        return self._client
+    
+    def _get_semaphore(self) -> asyncio.BoundedSemaphore:
+        """Return the semaphore capping concurrent API requests.
+        
+        Created on first use so it is bound to the running event loop.
+        """
+        if self._sem is None:
+            self._sem = asyncio.BoundedSemaphore(self._max_concurrency)
+        return self._sem
+    
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _cached_get(self, key: tuple, fetcher: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """Return a cached result for ``key`` or fetch and cache it for ``ttl`` seconds.
+        
+        Failed lookups (None) are not cached, and neither are results whose
+        fetch started before the last _invalidate. Concurrent misses are
+        already coalesced into one request by _make_request.
+        """
+        cache = self._caches.get(ttl)
+        if cache is None:
+            cache = self._caches[ttl] = cachetools.TTLCache(maxsize=1024, ttl=ttl)
+        
+        result = cache.get(key)
+        if result is None:
+            generation = self._generation
+            result = await fetcher()
+            if result is not None and generation == self._generation:
+                cache[key] = result
+        return result
+    
+    def _invalidate(self, prefix: str):
+        """Drop cached and in-flight results whose endpoint starts with ``prefix``.
+        
+        Fetches already running keep going for their current callers, but
+        later GETs start a fresh request and the stale result is not cached.
+        """
+        self._generation += 1
+        for key in [key for key in self._inflight if key[0].startswith(prefix)]:
+            del self._inflight[key]
+        for cache in self._caches.values():
+            for key in [key for key in cache.keys() if key[0].startswith(prefix)]:
+                cache.pop(key, None)
+    
+    def _parse_pet_list(self, body: bytes) -> List[Dict]:
+        """Parse a pet list, materializing only the fields format_pets_list reads.
+        
+        The simdjson document is consumed before returning, so the shared
+        parser is free again by the time another request is awaited.
+        """
+        pets = []
+        for pet in self._parser.parse(body):
+            item = {key: pet[key] for key in ("id", "name", "status") if key in pet}
+            category = pet.get("category")
+            if category:
+                item["category"] = {"name": category.get("name", "Unknown")}
+            tags = pet.get("tags")
+            if tags:
+                item["tags"] = [{"name": tag.get("name", "")} for tag in tags]
+            pets.append(item)
+        return pets
+    
+    def _auth_headers(self, auth_token: Optional[str]) -> Dict[str, str]:
+        """Build request headers carrying the bearer token, if any.
+        
+        The token is always sent per request rather than as a client default,
+        so a login while this request waits can't change who it is sent as.
+        """
+        if auth_token:
+            return {"Authorization": f"Bearer {auth_token}"}
+        return {}
     
     async def _make_request(
         self, 
@@ -30,142 +276,318 @@ class PetstoreClient:
         endpoint: str, 
         auth_token: Optional[str] = None,
         params: Optional[Dict] = None,
-        json_data: Optional[Dict] = None
+        json_data: Optional[Dict] = None,
+        parse: Callable[[bytes], Any] = orjson.loads,
+        content: Optional[bytes] = None
     ) -> Optional[Dict]:
-        """Make HTTP request to the API."""
-        url = f"{self.base_url}/api/v3{endpoint}"
-        headers = {}
+        """Make HTTP request to the API.
         
-        if auth_token:
-            headers["Authorization"] = f"Bearer {auth_token}"
+        The body is ``json_data`` serialized with orjson, or ``content`` if it
+        is already encoded JSON. ``parse`` turns the raw response body into
+        the return value. Identical concurrent GETs share a single in-flight
+        request.
+        """
+        if method != "GET":
+            if json_data is not None:
+                content = orjson.dumps(json_data)
+            return await self._send_request(method, endpoint, auth_token, params, content, parse)
+        
+        key = (endpoint, tuple(sorted((params or {}).items())), auth_token, parse)
+        task = self._inflight.get(key)
+        if task is None:
+            # The fetch runs as its own task so cancelling any caller, the
+            # first one included, never cancels it for the others
+            task = asyncio.ensure_future(self._send_request(method, endpoint, auth_token, params, None, parse))
+            self._inflight[key] = task
+            
+            def forget(done: asyncio.Task):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+    
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        auth_token: Optional[str],
+        params: Optional[Dict],
+        content: Optional[bytes],
+        parse: Callable[[bytes], Any]
+    ) -> Any:
+        """Send an HTTP request and parse a successful response.
+        
+        5xx responses and network errors are retried with backoff for GETs.
+        """
+        url = self._url_prefix + endpoint
+        headers = self._auth_headers(auth_token)
+        
+        if content is not None:
+            headers["Content-Type"] = "application/json"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    json=json_data
-                )
+            client_request = self._get_client().request
+            async for attempt in _retrying(method):
+                with attempt:
+                    async with self._get_semaphore():
+                        response = await client_request(
+                            method=method,
+                            url=url,
+                            headers=headers,
+                            params=params,
+                            content=content
+                        )
+                    if response.is_server_error:
+                        response.raise_for_status()
+            
+            if not self._http_version_logged:
+                self._http_version_logged = True
+                logger.debug("Connected to %s over %s", self.base_url, response.http_version)
+            
+            if response.is_success:
+                # 204 and other empty 2xx bodies have nothing to parse
+                return parse(response.content) if response.content else None
+            elif response.status_code == 404:
+                return None
+            else:
+                _log_failed_response(response)
+                return None
                 
-                if response.status_code == 200 or response.status_code == 201:
-                    return response.json()
-                elif response.status_code == 404:
-                    return None
-                else:
-                    print(f"API request failed: {response.status_code} - {response.text}")
-                    return None
+        except httpx.HTTPStatusError as e:
+            _log_failed_response(e.response)
+            return None
+        except Exception as e:
+            logger.exception("Request error: %s", e)
+            return None
+    
+    async def _stream_list(
+        self,
+        endpoint: str,
+        auth_token: Optional[str] = None,
+        params: Optional[Dict] = None
+    ) -> Optional[List[Dict]]:
+        """GET a JSON array, decoding it incrementally as the body arrives.
+        
+        Responses that announce a Content-Length below STREAM_THRESHOLD are
+        buffered and parsed in one go instead, where streaming would only
+        add overhead. A 5xx or network error restarts the whole request.
+        """
+        url = self._url_prefix + endpoint
+        headers = self._auth_headers(auth_token)
+        
+        try:
+            client = self._get_client()
+            async for attempt in _retrying("GET"):
+                with attempt:
+                    async with self._get_semaphore():
+                        async with client.stream("GET", url, headers=headers, params=params) as response:
+                            if response.status_code == 404:
+                                return None
+                            elif not response.is_success:
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    await response.aread()
+                                response.raise_for_status()
+                            
+                            if response.status_code == 204:
+                                return None
+                            
+                            length = response.headers.get("Content-Length")
+                            if length is not None and int(length) < STREAM_THRESHOLD:
+                                body = await response.aread()
+                                return self._parse_pet_list(body) if body else None
+                            
+                            chunks = response.aiter_bytes()
+                            first = await anext(chunks, b"")
+                            if not first:
+                                return None
+                            reader = _AsyncByteReader(chunks, first)
+                            return [pet async for pet in ijson.items_async(reader, "item", use_float=True)]
                     
+        except httpx.HTTPStatusError as e:
+            _log_failed_response(e.response)
+            return None
         except Exception as e:
-            print(f"Request error: {e}")
+            logger.exception("Request error: %s", e)
             return None
     
-    async def search_pets_by_status(self, status: str, auth_token: str = None) -> List[Dict]:
+    async def search_pets_by_status(self, status: str, auth_token: Optional[str] = None) -> List[Dict]:
         """Search for pets by status."""
         # This endpoint requires authentication based on business requirements
+        auth_token = auth_token or self._auth_token
         if not auth_token:
-            # For demo purposes, try to get a default token
-            # In practice, this would require proper authentication
             return []
             
-        result = await self._make_request("GET", "/pet/findByStatus", auth_token, {"status": status})
+        result = await self._stream_list("/pet/findByStatus", auth_token, {"status": status})
         return result or []
     
-    async def search_pets_by_tags(self, tags: List[str], auth_token: str = None) -> List[Dict]:
+    async def search_pets_by_tags(self, tags: List[str], auth_token: Optional[str] = None) -> List[Dict]:
         """Search for pets by tags."""
+        auth_token = auth_token or self._auth_token
         if not auth_token:
             return []
             
         tags_param = ",".join(tags)
-        result = await self._make_request("GET", "/pet/findByTags", auth_token, {"tags": tags_param})
+        result = await self._stream_list("/pet/findByTags", auth_token, {"tags": tags_param})
         return result or []
     
-    async def get_pet_by_id(self, pet_id: int, auth_token: str = None) -> Optional[Dict]:
+    async def get_pet_by_id(self, pet_id: int, auth_token: Optional[str] = None) -> Optional[Dict]:
         """Get a specific pet by ID."""
+        auth_token = auth_token or self._auth_token
         if not auth_token:
             return None
             
-        return await self._make_request("GET", f"/pet/{pet_id}", auth_token)
+        endpoint = f"/pet/{pet_id}"
+        return await self._cached_get(
+            (endpoint, auth_token),
+            lambda: self._make_request("GET", endpoint, auth_token),
+            DETAILS_CACHE_TTL
+        )
     
-    async def get_store_inventory(self, auth_token: str) -> Optional[Dict]:
+    async def get_store_inventory(self, auth_token: Optional[str] = None) -> Optional[Dict]:
         """Get store inventory (requires store_owner or admin role)."""
-        return await self._make_request("GET", "/store/inventory", auth_token)
+        auth_token = auth_token or self._auth_token
+        return await self._cached_get(
+            ("/store/inventory", auth_token),
+            lambda: self._make_request("GET", "/store/inventory", auth_token),
+            INVENTORY_CACHE_TTL
+        )
     
-    async def get_order_by_id(self, order_id: int, auth_token: str) -> Optional[Dict]:
+    async def get_store_inventory_text(self, auth_token: Optional[str] = None) -> Optional[str]:
+        """Get store inventory formatted as one "status: count pets" line per status."""
+        auth_token = auth_token or self._auth_token
+        return await self._cached_get(
+            ("/store/inventory", auth_token, "text"),
+            lambda: self._make_request("GET", "/store/inventory", auth_token, parse=_parse_inventory_to_lines),
+            INVENTORY_CACHE_TTL
+        )
+    
+    async def get_order_by_id(self, order_id: int, auth_token: Optional[str] = None) -> Optional[Dict]:
         """Get order details by ID."""
-        return await self._make_request("GET", f"/store/order/{order_id}", auth_token)
+        return await self._make_request("GET", f"/store/order/{order_id}", auth_token or self._auth_token)
     
-    async def place_order(self, pet_id: int, auth_token: str, ship_date: Optional[str] = None) -> Optional[Dict]:
+    async def place_order(self, pet_id: int, auth_token: Optional[str] = None, ship_date: Optional[str] = None) -> Optional[Dict]:
         """Place a new order for a pet."""
-        order_data = {
-            "petId": pet_id,
-            "quantity": 1,
-            "status": "placed",
-            "complete": False
-        }
-        
-        if ship_date:
-            order_data["shipDate"] = ship_date
+        ship = ship_date.encode() if ship_date else b""
+        if type(pet_id) is int and not _NEEDS_JSON_ESCAPE(ship):
+            content = _ORDER_BODY % (pet_id, b',"shipDate":"%s"' % ship if ship else b"")
+        else:
+            order_data = {
+                "petId": pet_id,
+                "quantity": 1,
+                "status": "placed",
+                "complete": False
+            }
+            
+            if ship_date:
+                order_data["shipDate"] = ship_date
+            
+            content = orjson.dumps(order_data)
             
-        return await self._make_request("POST", "/store/order", auth_token, json_data=order_data)
+        result = await self._make_request("POST", "/store/order", auth_token or self._auth_token, content=content)
+        # Placing an order changes the pet's status and the inventory counts
+        self._invalidate("/store/inventory")
+        self._invalidate(f"/pet/{pet_id}")
+        return result
     
     async def login_user(self, username: str, password: str) -> Optional[Dict]:
-        """Login user and get authentication token."""
-        return await self._make_request("GET", "/user/login", params={"username": username, "password": password})
+        """Login user and get authentication token.
+        
+        On success the token becomes the default for later requests.
+        Successful logins are cached for LOGIN_CACHE_TTL seconds, keyed by
+        username and a digest of the password.
+        """
+        key = (username, hashlib.blake2b(password.encode(), digest_size=16).digest())
+        result = self._login_cache.get(key)
+        if result is None:
+            result = await self._make_request("GET", "/user/login", params={"username": username, "password": password})
+            if not (result and "token" in result):
+                return result
+            self._login_cache[key] = result
+        
+        self._auth_token = result["token"]
+        return result
+    
+    def invalidate_login(self, username: str):
+        """Forget cached logins for ``username``, e.g. after logging out.
+        
+        If one of them holds the default token, that is cleared as well so
+        later requests are no longer sent as this user.
+        """
+        for key in [key for key in self._login_cache.keys() if key[0] == username]:
+            result = self._login_cache.pop(key, None)
+            if result is not None and result.get("token") == self._auth_token:
+                self._auth_token = None
     
-    async def get_user_profile(self, username: str, auth_token: str) -> Optional[Dict]:
+    async def get_user_profile(self, username: str, auth_token: Optional[str] = None) -> Optional[Dict]:
         """Get user profile information."""
-        return await self._make_request("GET", f"/user/{username}", auth_token)
+        auth_token = auth_token or self._auth_token
+        endpoint = f"/user/{username}"
+        return await self._cached_get(
+            (endpoint, auth_token),
+            lambda: self._make_request("GET", endpoint, auth_token),
+            DETAILS_CACHE_TTL
+        )
     
     async def create_user(self, user_data: Dict) -> Optional[Dict]:
         """Create a new user account."""
         return await self._make_request("POST", "/user", json_data=user_data)
     
-    async def add_pet(self, pet_data: Dict, auth_token: str) -> Optional[Dict]:
+    async def add_pet(self, pet_data: Dict, auth_token: Optional[str] = None) -> Optional[Dict]:
         """Add a new pet to the store."""
-        return await self._make_request("POST", "/pet", auth_token, json_data=pet_data)
+        result = await self._make_request("POST", "/pet", auth_token or self._auth_token, json_data=pet_data)
+        self._invalidate("/pet/")
+        self._invalidate("/store/inventory")
+        return result
     
-    def format_pets_list(self, pets: List[Dict]) -> str:
-        """Format a list of pets for display."""
-        if not pets:
-            return "No pets found."
-        
+    def format_pets_list(self, pets: Iterable[Dict]) -> str:
+        """Format a list (or any iterable) of pets for display."""
         formatted = []
+        append = formatted.append
         for pet in pets:
-            category = pet.get("category", {}).get("name", "Unknown") if pet.get("category") else "Unknown"
-            tags = ", ".join([tag.get("name", "") for tag in pet.get("tags", [])])
-            formatted.append(f"• {pet.get('name', 'Unnamed')} (ID: {pet.get('id')}) - {category} - Status: {pet.get('status')} - Tags: {tags or 'None'}")
+            get = pet.get
+            category = (get("category") or {}).get("name", "Unknown")
+            tags = ", ".join(tag.get("name", "") for tag in get("tags") or ())
+            append(_PET_LINE(
+                name=get("name", "Unnamed"),
+                id=get("id"),
+                category=category,
+                status=get("status"),
+                tags=tags or "None"
+            ))
+        
+        if not formatted:
+            return "No pets found."
         
-        return "\\n".join(formatted)
+        return "\n".join(formatted)
     
     def format_pet_details(self, pet: Dict) -> str:
         """Format pet details for display."""
-        category = pet.get("category", {}).get("name", "Unknown") if pet.get("category") else "Unknown"
-        tags = ", ".join([tag.get("name", "") for tag in pet.get("tags", [])])
-        photos = ", ".join(pet.get("photoUrls", []))
+        get = pet.get
+        category = (get("category") or {}).get("name", "Unknown")
+        tags = ", ".join(tag.get("name", "") for tag in get("tags") or ())
+        photos = ", ".join(get("photoUrls") or ())
         
-        return f"""Name: {pet.get('name', 'Unnamed')}
-ID: {pet.get('id')}
-Category: {category}
-Status: {pet.get('status')}
-Tags: {tags or 'None'}
-Photos: {photos or 'None'}"""
+        return "\n".join([
+            "Name: " + str(get("name", "Unnamed")),
+            "ID: " + str(get("id")),
+            "Category: " + str(category),
+            "Status: " + str(get("status")),
+            "Tags: " + (tags or "None"),
+            "Photos: " + (photos or "None")
+        ])
     
     def format_order_details(self, order: Dict) -> str:
         """Format order details for display."""
-        return f"""Order ID: {order.get('id')}
-Pet ID: {order.get('petId')}
-Quantity: {order.get('quantity')}
-Status: {order.get('status')}
-Ship Date: {order.get('shipDate', 'Not set')}
-Complete: {order.get('complete', False)}"""
+        get = order.get
+        return "\n".join([label + ": " + str(get(key, default)) for label, key, default in _ORDER_FIELDS])
     
     def format_user_details(self, user: Dict) -> str:
         """Format user details for display."""
-        return f"""Username: {user.get('username')}
-Name: {user.get('firstName', '')} {user.get('lastName', '')}
-Email: {user.get('email', 'Not provided')}
-Phone: {user.get('phone', 'Not provided')}
-Role: {user.get('role', 'customer')}
-Status: {user.get('userStatus', 1)}"""
\ No newline at end of file
+        get = user.get
+        lines = [
+            "Username: " + str(get("username")),
+            "Name: " + str(get("firstName", "")) + " " + str(get("lastName", ""))
+        ]
+        lines += [label + ": " + str(get(key, default)) for label, key, default in _USER_FIELDS]
+        return "\n".join(lines)
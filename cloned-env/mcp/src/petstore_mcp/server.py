@@ -8,8 +8,9 @@ Provides tools to interact with the Petstore API including:
 """
 
 import asyncio
+import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -23,318 +24,374 @@ app = Server("petstore-mcp")
 # Initialize API client
 api_client = PetstoreClient()
 
-@app.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available tools for the Petstore API."""
-    return [
-        Tool(
-            name="search_pets_by_status",
-            description="Search for pets by their availability status (available, pending, sold)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "status": {
-                        "type": "string",
-                        "enum": ["available", "pending", "sold"],
-                        "description": "Pet status to search for"
-                    }
+# Maps create_user tool arguments to Petstore API user fields
+_USER_KEY_MAP = {
+    "username": "username",
+    "password": "password",
+    "email": "email",
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "phone": "phone"
+}
+
+# Tool definitions are static, so build them once
+_TOOLS = [
+    Tool(
+        name="search_pets_by_status",
+        description="Search for pets by their availability status (available, pending, sold)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "status": {
+                    "type": "string",
+                    "enum": ["available", "pending", "sold"],
+                    "description": "Pet status to search for"
                 },
-                "required": ["status"]
-            }
-        ),
-        Tool(
-            name="search_pets_by_tags",
-            description="Search for pets by tag names",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Array of tag names to search for"
-                    }
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["status"]
+        }
+    ),
+    Tool(
+        name="search_pets_by_tags",
+        description="Search for pets by tag names",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Array of tag names to search for"
                 },
-                "required": ["tags"]
-            }
-        ),
-        Tool(
-            name="get_pet_by_id",
-            description="Get detailed information about a specific pet",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pet_id": {
-                        "type": "integer",
-                        "description": "ID of the pet to retrieve"
-                    }
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["tags"]
+        }
+    ),
+    Tool(
+        name="get_pet_by_id",
+        description="Get detailed information about a specific pet",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pet_id": {
+                    "type": "integer",
+                    "description": "ID of the pet to retrieve"
                 },
-                "required": ["pet_id"]
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["pet_id"]
+        }
+    ),
+    Tool(
+        name="get_store_inventory",
+        description="Get inventory counts by pet status (requires store_owner or admin role)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
             }
-        ),
-        Tool(
-            name="get_store_inventory",
-            description="Get inventory counts by pet status (requires store_owner or admin role)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "auth_token": {
-                        "type": "string",
-                        "description": "JWT authentication token"
-                    }
+        }
+    ),
+    Tool(
+        name="get_order_by_id",
+        description="Get details of a specific order",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "order_id": {
+                    "type": "integer",
+                    "description": "ID of the order to retrieve"
                 },
-                "required": ["auth_token"]
-            }
-        ),
-        Tool(
-            name="get_order_by_id",
-            description="Get details of a specific order",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "order_id": {
-                        "type": "integer",
-                        "description": "ID of the order to retrieve"
-                    },
-                    "auth_token": {
-                        "type": "string",
-                        "description": "JWT authentication token"
-                    }
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["order_id"]
+        }
+    ),
+    Tool(
+        name="place_order",
+        description="Place a new order for a pet",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pet_id": {
+                    "type": "integer",
+                    "description": "ID of the pet to order"
                 },
-                "required": ["order_id", "auth_token"]
-            }
-        ),
-        Tool(
-            name="place_order",
-            description="Place a new order for a pet",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pet_id": {
-                        "type": "integer",
-                        "description": "ID of the pet to order"
-                    },
-                    "ship_date": {
-                        "type": "string",
-                        "description": "Shipping date in ISO format",
-                        "format": "date-time"
-                    },
-                    "auth_token": {
-                        "type": "string",
-                        "description": "JWT authentication token"
-                    }
+                "ship_date": {
+                    "type": "string",
+                    "description": "Shipping date in ISO format",
+                    "format": "date-time"
                 },
-                "required": ["pet_id", "auth_token"]
-            }
-        ),
-        Tool(
-            name="login_user",
-            description="Log in a user and get authentication token",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "username": {
-                        "type": "string",
-                        "description": "Username"
-                    },
-                    "password": {
-                        "type": "string",
-                        "description": "Password"
-                    }
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["pet_id"]
+        }
+    ),
+    Tool(
+        name="login_user",
+        description="Log in a user and get authentication token",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "username": {
+                    "type": "string",
+                    "description": "Username"
                 },
-                "required": ["username", "password"]
-            }
-        ),
-        Tool(
-            name="get_user_profile",
-            description="Get user profile information",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "username": {
-                        "type": "string",
-                        "description": "Username to retrieve"
-                    },
-                    "auth_token": {
-                        "type": "string",
-                        "description": "JWT authentication token"
-                    }
+                "password": {
+                    "type": "string",
+                    "description": "Password"
+                }
+            },
+            "required": ["username", "password"]
+        }
+    ),
+    Tool(
+        name="get_user_profile",
+        description="Get user profile information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "username": {
+                    "type": "string",
+                    "description": "Username to retrieve"
                 },
-                "required": ["username", "auth_token"]
-            }
-        ),
-        Tool(
-            name="create_user",
-            description="Create a new user account",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "username": {
-                        "type": "string",
-                        "description": "Username for the new account"
-                    },
-                    "password": {
-                        "type": "string",
-                        "description": "Password for the new account"
-                    },
-                    "email": {
-                        "type": "string",
-                        "description": "Email address"
-                    },
-                    "first_name": {
-                        "type": "string",
-                        "description": "First name"
-                    },
-                    "last_name": {
-                        "type": "string",
-                        "description": "Last name"
-                    },
-                    "phone": {
-                        "type": "string",
-                        "description": "Phone number"
-                    }
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["username"]
+        }
+    ),
+    Tool(
+        name="create_user",
+        description="Create a new user account",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "username": {
+                    "type": "string",
+                    "description": "Username for the new account"
                 },
-                "required": ["username", "password"]
-            }
-        ),
-        Tool(
-            name="add_pet",
-            description="Add a new pet to the store (requires store_owner or admin role)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Pet name"
-                    },
-                    "category_name": {
-                        "type": "string",
-                        "description": "Category name (e.g., Dogs, Cats)"
-                    },
-                    "status": {
-                        "type": "string",
-                        "enum": ["available", "pending", "sold"],
-                        "description": "Pet status",
-                        "default": "available"
-                    },
-                    "photo_urls": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Array of photo URLs"
-                    },
-                    "tag_names": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Array of tag names"
-                    },
-                    "auth_token": {
-                        "type": "string",
-                        "description": "JWT authentication token"
-                    }
+                "password": {
+                    "type": "string",
+                    "description": "Password for the new account"
                 },
-                "required": ["name", "auth_token"]
-            }
-        )
-    ]
+                "email": {
+                    "type": "string",
+                    "description": "Email address"
+                },
+                "first_name": {
+                    "type": "string",
+                    "description": "First name"
+                },
+                "last_name": {
+                    "type": "string",
+                    "description": "Last name"
+                },
+                "phone": {
+                    "type": "string",
+                    "description": "Phone number"
+                }
+            },
+            "required": ["username", "password"]
+        }
+    ),
+    Tool(
+        name="add_pet",
+        description="Add a new pet to the store (requires store_owner or admin role)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Pet name"
+                },
+                "category_name": {
+                    "type": "string",
+                    "description": "Category name (e.g., Dogs, Cats)"
+                },
+                "status": {
+                    "type": "string",
+                    "enum": ["available", "pending", "sold"],
+                    "description": "Pet status",
+                    "default": "available"
+                },
+                "photo_urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Array of photo URLs"
+                },
+                "tag_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Array of tag names"
+                },
+                "auth_token": {
+                    "type": "string",
+                    "description": "JWT authentication token (defaults to the token from the last login_user call)"
+                }
+            },
+            "required": ["name"]
+        }
+    )
+]
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle tool calls."""
-    try:
-        if name == "search_pets_by_status":
-            result = await api_client.search_pets_by_status(arguments["status"])
-            return [TextContent(type="text", text=f"Found {len(result)} pets with status '{arguments['status']}':\\n{api_client.format_pets_list(result)}")]
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available tools for the Petstore API."""
+    return _TOOLS
 
-        elif name == "search_pets_by_tags":
-            tags = arguments["tags"]
-            result = await api_client.search_pets_by_tags(tags)
-            return [TextContent(type="text", text=f"Found {len(result)} pets with tags {tags}:\\n{api_client.format_pets_list(result)}")]
+# Static prefixes for tool responses
+_TXT_PET_DETAILS = "Pet Details:\n"
+_TXT_PET_OK = "Pet added successfully:\n"
+_TXT_INVENTORY = "Store Inventory:\n"
+_TXT_ORDER_DETAILS = "Order Details:\n"
+_TXT_ORDER_OK = "Order placed successfully:\n"
+_TXT_USER_PROFILE = "User Profile:\n"
+_TXT_USER_OK = "User created successfully:\n"
 
-        elif name == "get_pet_by_id":
-            result = await api_client.get_pet_by_id(arguments["pet_id"])
-            if result:
-                return [TextContent(type="text", text=f"Pet Details:\\n{api_client.format_pet_details(result)}")]
-            else:
-                return [TextContent(type="text", text="Pet not found")]
+async def _h_search_pets_by_status(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the search_pets_by_status tool."""
+    status = args["status"]
+    result = await api_client.search_pets_by_status(status, args.get("auth_token"))
+    return [TextContent(type="text", text=f"Found {len(result)} pets with status '{status}':\n{api_client.format_pets_list(result)}")]
 
-        elif name == "get_store_inventory":
-            result = await api_client.get_store_inventory(arguments["auth_token"])
-            if result:
-                inventory_text = "\\n".join([f"{status}: {count} pets" for status, count in result.items()])
-                return [TextContent(type="text", text=f"Store Inventory:\\n{inventory_text}")]
-            else:
-                return [TextContent(type="text", text="Failed to retrieve inventory")]
+async def _h_search_pets_by_tags(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the search_pets_by_tags tool."""
+    tags = args["tags"]
+    result = await api_client.search_pets_by_tags(tags, args.get("auth_token"))
+    return [TextContent(type="text", text=f"Found {len(result)} pets with tags {tags}:\n{api_client.format_pets_list(result)}")]
 
-        elif name == "get_order_by_id":
-            result = await api_client.get_order_by_id(arguments["order_id"], arguments["auth_token"])
-            if result:
-                return [TextContent(type="text", text=f"Order Details:\\n{api_client.format_order_details(result)}")]
-            else:
-                return [TextContent(type="text", text="Order not found or access denied")]
+async def _h_get_pet_by_id(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the get_pet_by_id tool."""
+    result = await api_client.get_pet_by_id(args["pet_id"], args.get("auth_token"))
+    if result:
+        return [TextContent(type="text", text=_TXT_PET_DETAILS + api_client.format_pet_details(result))]
+    else:
+        return [TextContent(type="text", text="Pet not found")]
 
-        elif name == "place_order":
-            pet_id = arguments["pet_id"]
-            ship_date = arguments.get("ship_date")
-            auth_token = arguments["auth_token"]
-            
-            result = await api_client.place_order(pet_id, auth_token, ship_date)
-            if result:
-                return [TextContent(type="text", text=f"Order placed successfully:\\n{api_client.format_order_details(result)}")]
-            else:
-                return [TextContent(type="text", text="Failed to place order")]
+async def _h_get_store_inventory(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the get_store_inventory tool."""
+    inventory_text = await api_client.get_store_inventory_text(args.get("auth_token"))
+    if inventory_text:
+        return [TextContent(type="text", text=_TXT_INVENTORY + inventory_text)]
+    else:
+        return [TextContent(type="text", text="Failed to retrieve inventory")]
 
-        elif name == "login_user":
-            result = await api_client.login_user(arguments["username"], arguments["password"])
-            if result and "token" in result:
-                return [TextContent(type="text", text=f"Login successful! Token: {result['token']}")]
-            else:
-                return [TextContent(type="text", text="Login failed - invalid credentials")]
+async def _h_get_order_by_id(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the get_order_by_id tool."""
+    result = await api_client.get_order_by_id(args["order_id"], args.get("auth_token"))
+    if result:
+        return [TextContent(type="text", text=_TXT_ORDER_DETAILS + api_client.format_order_details(result))]
+    else:
+        return [TextContent(type="text", text="Order not found or access denied")]
 
-        elif name == "get_user_profile":
-            result = await api_client.get_user_profile(arguments["username"], arguments["auth_token"])
-            if result:
-                return [TextContent(type="text", text=f"User Profile:\\n{api_client.format_user_details(result)}")]
-            else:
-                return [TextContent(type="text", text="User not found or access denied")]
+async def _h_place_order(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the place_order tool."""
+    result = await api_client.place_order(args["pet_id"], args.get("auth_token"), args.get("ship_date"))
+    if result:
+        return [TextContent(type="text", text=_TXT_ORDER_OK + api_client.format_order_details(result))]
+    else:
+        return [TextContent(type="text", text="Failed to place order")]
 
-        elif name == "create_user":
-            user_data = {
-                "username": arguments["username"],
-                "password": arguments["password"],
-                "email": arguments.get("email"),
-                "firstName": arguments.get("first_name"),
-                "lastName": arguments.get("last_name"),
-                "phone": arguments.get("phone")
-            }
-            result = await api_client.create_user(user_data)
-            if result:
-                return [TextContent(type="text", text=f"User created successfully:\\n{api_client.format_user_details(result)}")]
-            else:
-                return [TextContent(type="text", text="Failed to create user")]
+async def _h_login_user(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the login_user tool."""
+    result = await api_client.login_user(args["username"], args["password"])
+    if result and "token" in result:
+        return [TextContent(type="text", text=f"Login successful! Token: {result['token']}")]
+    else:
+        return [TextContent(type="text", text="Login failed - invalid credentials")]
 
-        elif name == "add_pet":
-            pet_data = {
-                "name": arguments["name"],
-                "category": {"name": arguments.get("category_name", "Uncategorized")},
-                "status": arguments.get("status", "available"),
-                "photoUrls": arguments.get("photo_urls", []),
-                "tags": [{"name": tag} for tag in arguments.get("tag_names", [])]
-            }
-            result = await api_client.add_pet(pet_data, arguments["auth_token"])
-            if result:
-                return [TextContent(type="text", text=f"Pet added successfully:\\n{api_client.format_pet_details(result)}")]
-            else:
-                return [TextContent(type="text", text="Failed to add pet")]
+async def _h_get_user_profile(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the get_user_profile tool."""
+    result = await api_client.get_user_profile(args["username"], args.get("auth_token"))
+    if result:
+        return [TextContent(type="text", text=_TXT_USER_PROFILE + api_client.format_user_details(result))]
+    else:
+        return [TextContent(type="text", text="User not found or access denied")]
+
+async def _h_create_user(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the create_user tool."""
+    user_data = {api_key: args.get(arg) for arg, api_key in _USER_KEY_MAP.items()}
+    result = await api_client.create_user(user_data)
+    if result:
+        return [TextContent(type="text", text=_TXT_USER_OK + api_client.format_user_details(result))]
+    else:
+        return [TextContent(type="text", text="Failed to create user")]
 
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+async def _h_add_pet(args: Dict[str, Any]) -> List[TextContent]:
+    """Handle the add_pet tool."""
+    pet_data = {
+        "name": args["name"],
+        "category": {"name": args.get("category_name", "Uncategorized")},
+        "status": args.get("status", "available"),
+        "photoUrls": args.get("photo_urls", []),
+        "tags": [{"name": tag} for tag in args.get("tag_names") or ()]
+    }
+    result = await api_client.add_pet(pet_data, args.get("auth_token"))
+    if result:
+        return [TextContent(type="text", text=_TXT_PET_OK + api_client.format_pet_details(result))]
+    else:
+        return [TextContent(type="text", text="Failed to add pet")]
 
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[TextContent]]]] = {
+    "search_pets_by_status": _h_search_pets_by_status,
+    "search_pets_by_tags": _h_search_pets_by_tags,
+    "get_pet_by_id": _h_get_pet_by_id,
+    "get_store_inventory": _h_get_store_inventory,
+    "get_order_by_id": _h_get_order_by_id,
+    "place_order": _h_place_order,
+    "login_user": _h_login_user,
+    "get_user_profile": _h_get_user_profile,
+    "create_user": _h_create_user,
+    "add_pet": _h_add_pet,
+}
+
+@app.call_tool()
+async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    
+    try:
+        return await handler(arguments)
     except Exception as e:
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 async def main():
     """Main entry point for the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    # stdout carries the MCP protocol, so diagnostics must go to stderr
+    level = os.getenv("LOG_LEVEL", "WARNING").upper()
+    if level not in logging.getLevelNamesMapping():
+        level = "WARNING"
+    logging.basicConfig(level=level)
+    
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        await api_client.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file